@@ -0,0 +1,107 @@
+import asyncio
+import math
+from collections import deque
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RouteLimit:
+    concurrency: int
+    queue: int
+    queue_timeout: float
+
+    def __post_init__(self) -> None:
+        if self.concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {self.concurrency}")
+        if self.queue < 0:
+            raise ValueError(f"queue must not be negative, got {self.queue}")
+        if self.queue_timeout < 0:
+            raise ValueError(f"queue_timeout must not be negative, got {self.queue_timeout}")
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.queue_timeout))
+
+
+class RouteGate:
+    """Concurrency limit with a bounded wait queue for one route.
+
+    Admission is decided synchronously before the first ``await`` so a burst
+    arriving in one loop iteration is still capped at ``concurrency + queue``.
+    """
+
+    def __init__(self, limit: RouteLimit) -> None:
+        self.limit = limit
+        self._waiters: deque[asyncio.Future] = deque()
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; ``False`` means the request should be shed."""
+        if self.in_flight < self.limit.concurrency and not self.queued:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if self.in_flight + self.queued >= self.limit.concurrency + self.limit.queue:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await asyncio.wait((waiter,), timeout=self.limit.queue_timeout)
+        except BaseException:
+            if waiter.done():
+                # The slot was handed over but the request went away.
+                self.release()
+            else:
+                waiter.cancel()
+                self.queued -= 1
+            raise
+        if waiter.done():
+            return True
+        waiter.cancel()
+        self.queued -= 1
+        self.timed_out += 1
+        return False
+
+    def release(self) -> None:
+        """Hand the slot to the oldest waiter, or free it if nobody is waiting."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.queued -= 1
+                self.admitted += 1
+                return
+        self.in_flight -= 1
+
+    def status(self) -> dict:
+        return {
+            "concurrency": self.limit.concurrency,
+            "queue_limit": self.limit.queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "saturation": round(self.in_flight / self.limit.concurrency, 3),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+class AdmissionController:
+    def __init__(self, limits: dict[str, RouteLimit]) -> None:
+        self._gates = {path: RouteGate(limit) for path, limit in limits.items()}
+
+    def gate(self, path: str) -> RouteGate | None:
+        return self._gates.get(path)
+
+    def status(self) -> dict:
+        return {path: gate.status() for path, gate in self._gates.items()}
@@ -1,14 +1,26 @@
+import asyncio
+import json
 from datetime import datetime, timezone
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from telebot import TeleBot
 from telebot.apihelper import ApiTelegramException
 
+from admission import AdmissionController, RouteLimit
+from db_maintenance import DatabaseMaintenance
+from outage_schedule import UpcomingOutages
+from profiling import Profiler, instrument_api_routes
 from reminders import ReminderService
 from storage import Database
 
 
+ADMISSION_ROUTES = ("/check-sub", "/check-legal")
+
+DEFAULT_ROUTE_LIMIT = RouteLimit(concurrency=16, queue=64, queue_timeout=2.0)
+
+
 def _parse_datetime(value: str) -> datetime:
     dt = datetime.fromisoformat(value)
     if dt.tzinfo is None:
@@ -16,8 +28,53 @@ def _parse_datetime(value: str) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
-def create_api_app(bot: TeleBot, api_secret: str, db: Database, reminders: ReminderService) -> FastAPI:
+def create_api_app(
+    bot: TeleBot,
+    api_secret: str,
+    db: Database,
+    reminders: ReminderService,
+    profiler: Profiler | None = None,
+    db_maintenance: DatabaseMaintenance | None = None,
+    route_limit: RouteLimit | None = None,
+) -> FastAPI:
     app = FastAPI(title="Subscription Checker")
+    profiler = profiler or Profiler("profiles")
+    upcoming_outages = UpcomingOutages(db)
+    admission = AdmissionController(
+        {path: route_limit or DEFAULT_ROUTE_LIMIT for path in ADMISSION_ROUTES}
+    )
+
+    def require_secret(x_api_secret: str | None = Header(default=None)) -> None:
+        """Check the ``X-API-Secret`` header so GET endpoints keep the secret out of URLs."""
+        if x_api_secret != api_secret:
+            raise HTTPException(
+                status_code=403,
+                detail={
+                    "error": "Invalid secret",
+                    "hint": "Check API_SECRET and the X-API-Secret header",
+                },
+            )
+
+    @app.middleware("http")
+    async def admit_requests(request: Request, call_next):
+        gate = admission.gate(request.url.path)
+        if gate is None:
+            return await call_next(request)
+        if not await gate.acquire():
+            return JSONResponse(
+                status_code=503,
+                content={
+                    "detail": {
+                        "error": "Server is overloaded",
+                        "hint": "Retry after the delay in the Retry-After header",
+                    }
+                },
+                headers={"Retry-After": str(gate.limit.retry_after)},
+            )
+        try:
+            return await call_next(request)
+        finally:
+            gate.release()
 
     class CheckSubscriptionRequest(BaseModel):
         secret: str
@@ -32,6 +89,10 @@ def create_api_app(bot: TeleBot, api_secret: str, db: Database, reminders: Remin
         secret: str
         name: str
 
+    class ProfileCaptureRequest(BaseModel):
+        secret: str
+        seconds: float = Field(default=30, gt=0, le=300)
+
     class CreateOutageRequest(BaseModel):
         secret: str
         name: str
@@ -43,7 +104,7 @@ def create_api_app(bot: TeleBot, api_secret: str, db: Database, reminders: Remin
             populate_by_name = True
 
     @app.post("/check-sub")
-    async def check_subscription(payload: CheckSubscriptionRequest):
+    def check_subscription(payload: CheckSubscriptionRequest):
         if payload.secret != api_secret:
             raise HTTPException(
                 status_code=403,
@@ -78,7 +139,7 @@ def create_api_app(bot: TeleBot, api_secret: str, db: Database, reminders: Remin
         return {"subscribed": subscribed}
 
     @app.post("/check-legal")
-    async def check_legal(payload: CheckLegalRequest):
+    def check_legal(payload: CheckLegalRequest):
         if payload.secret != api_secret:
             raise HTTPException(
                 status_code=403,
@@ -147,4 +208,104 @@ def create_api_app(bot: TeleBot, api_secret: str, db: Database, reminders: Remin
         deleted = db.delete_outage_by_name(payload.name)
         return {"deleted": deleted}
 
+    @app.get("/outages/upcoming")
+    async def list_upcoming_outages(request: Request):
+        snapshot = upcoming_outages.snapshot()
+        headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in tags or snapshot.etag in tags:
+                return Response(status_code=304, headers=headers)
+        return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+    @app.get("/debug/profile")
+    async def profile_status(_: None = Depends(require_secret)):
+        return profiler.status()
+
+    @app.post("/debug/profile")
+    async def capture_profile(payload: ProfileCaptureRequest):
+        if payload.secret != api_secret:
+            raise HTTPException(
+                status_code=403,
+                detail={
+                    "error": "Invalid secret",
+                    "hint": "Check API_SECRET and request payload",
+                },
+            )
+
+        path = profiler.start_capture(payload.seconds)
+        if path is None:
+            raise HTTPException(
+                status_code=409,
+                detail={
+                    "error": "Capture already running",
+                    "hint": "Wait for the current capture to finish",
+                },
+            )
+        return {"path": path, "seconds": payload.seconds}
+
+    @app.get("/db/status")
+    async def db_status(_: None = Depends(require_secret)):
+        if db_maintenance is None:
+            return {"wal_size": db.wal_size(), "maintenance": False}
+        return {**db_maintenance.status(), "maintenance": True}
+
+    @app.get("/admission/status")
+    async def admission_status(_: None = Depends(require_secret)):
+        return admission.status()
+
+    def _outage_stats_payload(outage) -> dict:
+        items = reminders.stats.outage_stats(int(outage["id"]))
+        return {
+            "outage_id": int(outage["id"]),
+            "name": outage["name"],
+            "starts_at": int(outage["starts_at"]),
+            "ends_at": int(outage["ends_at"]),
+            "in_flight": any(item["in_flight"] for item in items),
+            "reminders": items,
+        }
+
+    def _get_outage_or_404(outage_id: int):
+        outage = db.get_outage(outage_id)
+        if outage is None:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": "Outage not found",
+                    "outage_id": outage_id,
+                },
+            )
+        return outage
+
+    @app.get("/outages/{outage_id}/stats")
+    async def outage_stats(outage_id: int, _: None = Depends(require_secret)):
+        outage = _get_outage_or_404(outage_id)
+        return _outage_stats_payload(outage)
+
+    @app.get("/outages/{outage_id}/stats/stream")
+    async def outage_stats_stream(
+        outage_id: int,
+        interval: float = 1.0,
+        _: None = Depends(require_secret),
+    ):
+        outage = _get_outage_or_404(outage_id)
+        interval = min(max(interval, 0.2), 30.0)
+
+        async def events():
+            while True:
+                payload = _outage_stats_payload(outage)
+                event = "progress" if payload["in_flight"] else "done"
+                yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+                if not payload["in_flight"]:
+                    return
+                await asyncio.sleep(interval)
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    instrument_api_routes(app, profiler)
     return app
@@ -3,9 +3,13 @@ import threading
 import uvicorn
 from telebot import TeleBot
 
+from admission import RouteLimit
 from api_server import create_api_app
 from config import load_settings
+from db_maintenance import DatabaseMaintenance
 from handlers.user_game import register_user_game_handlers
+from message_templates import MessageTemplates
+from profiling import Profiler, instrument_bot_handlers
 from reminders import ReminderService
 from storage import Database
 
@@ -25,14 +29,47 @@ def main() -> None:
     settings = load_settings()
     bot = TeleBot(settings.bot_token, parse_mode="HTML")
 
-    db = Database(settings.db_path)
+    db = Database(settings.db_path, tuning=settings.sqlite_tuning)
     db.init()
-    reminder_service = ReminderService(bot, db, game_url=settings.game_url)
+    db_maintenance = DatabaseMaintenance(
+        db,
+        checkpoint_interval=settings.db_checkpoint_interval,
+        wal_size_threshold=settings.db_wal_size_threshold,
+        optimize_interval=settings.db_optimize_interval,
+    )
+    db_maintenance.start()
+    profiler = Profiler(settings.profile_dir, enabled=settings.profiling_enabled)
+    templates = (
+        MessageTemplates.from_file(settings.message_templates_path)
+        if settings.message_templates_path
+        else MessageTemplates()
+    )
+    reminder_service = ReminderService(
+        bot,
+        db,
+        game_url=settings.game_url,
+        profiler=profiler,
+        templates=templates,
+    )
     reminder_service.start()
 
     register_user_game_handlers(bot, db)
+    instrument_bot_handlers(bot, profiler)
 
-    app = create_api_app(bot, settings.api_secret, db, reminder_service)
+    route_limit = RouteLimit(
+        concurrency=settings.api_concurrency_limit,
+        queue=settings.api_queue_limit,
+        queue_timeout=settings.api_queue_timeout_ms / 1000,
+    )
+    app = create_api_app(
+        bot,
+        settings.api_secret,
+        db,
+        reminder_service,
+        profiler,
+        db_maintenance,
+        route_limit,
+    )
     start_api_server(app)
 
     bot.infinity_polling(skip_pending=True, allowed_updates=["message", "callback_query"])
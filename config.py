@@ -1,9 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from dotenv import load_dotenv
 import os
 
+from storage import SqliteTuning
+
 
 @dataclass
 class Settings:
@@ -11,6 +13,26 @@ class Settings:
     api_secret: str
     db_path: str
     game_url: str | None
+    profiling_enabled: bool = False
+    profile_dir: str = "profiles"
+    sqlite_tuning: SqliteTuning = field(default_factory=SqliteTuning)
+    db_checkpoint_interval: int = 300
+    db_wal_size_threshold: int = 64 * 1024 * 1024
+    db_optimize_interval: int = 3600
+    message_templates_path: str | None = None
+    api_concurrency_limit: int = 16
+    api_queue_limit: int = 64
+    api_queue_timeout_ms: int = 2000
+
+
+def _int_env(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an integer, got {value!r}.") from exc
 
 
 def load_settings(env_file: str | None = None) -> Settings:
@@ -25,10 +47,53 @@ def load_settings(env_file: str | None = None) -> Settings:
     api_secret = os.getenv("API_SECRET")
     db_path = os.getenv("DB_PATH") or str(Path(__file__).parent / "data.sqlite3")
     game_url = os.getenv("GAME_URL", 'https://t.me/stakanonlinebot/game')
+    profiling_enabled = os.getenv("PROFILING", "").lower() in {"1", "true", "yes", "on"}
+    profile_dir = os.getenv("PROFILE_DIR") or str(Path(__file__).parent / "profiles")
+    defaults = SqliteTuning()
+    sqlite_tuning = SqliteTuning(
+        synchronous=os.getenv("SQLITE_SYNCHRONOUS") or defaults.synchronous,
+        cache_size=_int_env("SQLITE_CACHE_SIZE", defaults.cache_size),
+        mmap_size=_int_env("SQLITE_MMAP_SIZE", defaults.mmap_size),
+        busy_timeout=_int_env("SQLITE_BUSY_TIMEOUT", defaults.busy_timeout),
+        temp_store=os.getenv("SQLITE_TEMP_STORE") or defaults.temp_store,
+    )
+    db_checkpoint_interval = _int_env("DB_CHECKPOINT_INTERVAL", 300)
+    db_wal_size_threshold = _int_env("DB_WAL_SIZE_THRESHOLD", 64 * 1024 * 1024)
+    db_optimize_interval = _int_env("DB_OPTIMIZE_INTERVAL", 3600)
+    message_templates_path = os.getenv("MESSAGE_TEMPLATES_PATH") or None
+    api_concurrency_limit = _int_env("API_CONCURRENCY_LIMIT", 16)
+    api_queue_limit = _int_env("API_QUEUE_LIMIT", 64)
+    api_queue_timeout_ms = _int_env("API_QUEUE_TIMEOUT_MS", 2000)
+
+    if db_checkpoint_interval < 1:
+        raise ValueError("DB_CHECKPOINT_INTERVAL must be at least 1 second.")
+    if db_optimize_interval < 1:
+        raise ValueError("DB_OPTIMIZE_INTERVAL must be at least 1 second.")
+    if api_concurrency_limit < 1:
+        raise ValueError("API_CONCURRENCY_LIMIT must be at least 1.")
+    if api_queue_limit < 0:
+        raise ValueError("API_QUEUE_LIMIT must not be negative.")
+    if api_queue_timeout_ms < 0:
+        raise ValueError("API_QUEUE_TIMEOUT_MS must not be negative.")
 
     if not bot_token:
         raise ValueError("BOT_TOKEN is required. Set it in the .env file or environment variables.")
     if not api_secret:
         raise ValueError("API_SECRET is required. Set it in the .env file or environment variables.")
 
-    return Settings(bot_token=bot_token, api_secret=api_secret, db_path=db_path, game_url=game_url)
+    return Settings(
+        bot_token=bot_token,
+        api_secret=api_secret,
+        db_path=db_path,
+        game_url=game_url,
+        profiling_enabled=profiling_enabled,
+        profile_dir=profile_dir,
+        sqlite_tuning=sqlite_tuning,
+        db_checkpoint_interval=db_checkpoint_interval,
+        db_wal_size_threshold=db_wal_size_threshold,
+        db_optimize_interval=db_optimize_interval,
+        message_templates_path=message_templates_path,
+        api_concurrency_limit=api_concurrency_limit,
+        api_queue_limit=api_queue_limit,
+        api_queue_timeout_ms=api_queue_timeout_ms,
+    )
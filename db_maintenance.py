@@ -0,0 +1,110 @@
+import threading
+import time
+
+from storage import Database
+
+
+class DatabaseMaintenance:
+    """Background WAL checkpoints and periodic ``PRAGMA optimize``.
+
+    A passive checkpoint runs every ``checkpoint_interval`` seconds; once the
+    ``-wal`` file grows past ``wal_size_threshold`` bytes a truncating one is
+    used instead so the file shrinks back. Unless given, ``poll_interval`` is
+    the shortest of the two intervals, capped at 30 seconds.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        poll_interval: int | None = None,
+        checkpoint_interval: int = 300,
+        wal_size_threshold: int = 64 * 1024 * 1024,
+        optimize_interval: int = 3600,
+    ) -> None:
+        if min(checkpoint_interval, optimize_interval) < 1:
+            raise ValueError("Maintenance intervals must be at least 1 second.")
+        self._db = db
+        if poll_interval is None:
+            poll_interval = min(checkpoint_interval, optimize_interval, 30)
+        self._poll_interval = poll_interval
+        self._checkpoint_interval = checkpoint_interval
+        self._wal_size_threshold = wal_size_threshold
+        self._optimize_interval = optimize_interval
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._last_checkpoint_at = time.monotonic()
+        self._last_optimize_at = time.monotonic()
+        self._status: dict = {
+            "wal_size": 0,
+            "checkpoints": 0,
+            "last_checkpoint": None,
+            "max_checkpoint_duration": 0.0,
+            "optimizes": 0,
+            "last_optimize_duration": None,
+            "last_error": None,
+        }
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def status(self) -> dict:
+        with self._lock:
+            status = dict(self._status)
+        status["wal_size"] = self._db.wal_size()
+        return status
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._poll_interval):
+            try:
+                self._tick()
+            except Exception as exc:
+                with self._lock:
+                    self._status["last_error"] = repr(exc)
+
+    def _tick(self) -> None:
+        now = time.monotonic()
+        wal_size = self._db.wal_size()
+        with self._lock:
+            self._status["wal_size"] = wal_size
+
+        if wal_size >= self._wal_size_threshold:
+            self._checkpoint("TRUNCATE", wal_size)
+        elif now - self._last_checkpoint_at >= self._checkpoint_interval:
+            self._checkpoint("PASSIVE", wal_size)
+
+        if now - self._last_optimize_at >= self._optimize_interval:
+            started = time.perf_counter()
+            self._db.optimize()
+            duration = time.perf_counter() - started
+            self._last_optimize_at = now
+            with self._lock:
+                self._status["optimizes"] += 1
+                self._status["last_optimize_duration"] = round(duration, 4)
+
+    def _checkpoint(self, mode: str, wal_size: int) -> None:
+        started = time.perf_counter()
+        busy, wal_frames, checkpointed = self._db.checkpoint(mode)
+        duration = time.perf_counter() - started
+        self._last_checkpoint_at = time.monotonic()
+        with self._lock:
+            self._status["checkpoints"] += 1
+            self._status["last_checkpoint"] = {
+                "mode": mode,
+                "at": int(time.time()),
+                "duration": round(duration, 4),
+                "busy": bool(busy),
+                "wal_frames": wal_frames,
+                "checkpointed_frames": checkpointed,
+                "wal_size_before": wal_size,
+                "wal_size_after": self._db.wal_size(),
+            }
+            self._status["max_checkpoint_duration"] = max(
+                self._status["max_checkpoint_duration"], round(duration, 4)
+            )
@@ -0,0 +1,149 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+
+from storage import Database
+
+
+@dataclass
+class ReminderStats:
+    reminder_id: int
+    outage_id: int
+    type: str
+    targeted: int = 0
+    sent: int = 0
+    failed_by_error: dict[str, int] = field(default_factory=dict)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def failed(self) -> int:
+        return sum(self.failed_by_error.values())
+
+    def to_row(self) -> dict:
+        return {
+            "reminder_id": self.reminder_id,
+            "outage_id": self.outage_id,
+            "type": self.type,
+            "targeted": self.targeted,
+            "sent": self.sent,
+            "failed": self.failed,
+            "failed_by_error": dict(self.failed_by_error),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def describe_stats(row: dict, now: float | None = None) -> dict:
+    """Add derived duration, throughput and ETA fields to a stats row."""
+    if now is None:
+        now = time.time()
+    item = dict(row)
+    started_at = item.get("started_at")
+    finished_at = item.get("finished_at")
+    processed = item["sent"] + item["failed"]
+    duration = 0.0
+    if started_at is not None:
+        duration = max((finished_at or now) - started_at, 0.0)
+    rate = processed / duration if duration > 0 else 0.0
+    item["in_flight"] = started_at is not None and finished_at is None
+    item["duration"] = round(duration, 3)
+    item["msgs_per_sec"] = round(rate, 2)
+    item["eta_seconds"] = None
+    if item["in_flight"] and rate > 0:
+        remaining = max(item["targeted"] - processed, 0)
+        item["eta_seconds"] = round(remaining / rate, 1)
+    return item
+
+
+class DeliveryStats:
+    """Per-reminder delivery counters kept in memory and flushed to the DB in batches."""
+
+    def __init__(self, db: Database, flush_every: int = 500) -> None:
+        self._db = db
+        self._flush_every = flush_every
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._live: dict[int, ReminderStats] = {}
+        self._dirty: set[int] = set()
+        self._pending = 0
+
+    def begin(self, reminder, targeted: int) -> None:
+        stats = ReminderStats(
+            reminder_id=int(reminder["id"]),
+            outage_id=int(reminder["outage_id"]),
+            type=reminder["type"],
+            targeted=targeted,
+            started_at=time.time(),
+        )
+        with self._lock:
+            self._live[stats.reminder_id] = stats
+            self._dirty.add(stats.reminder_id)
+        self.flush()
+
+    def record_sent(self, reminder_id: int) -> None:
+        with self._lock:
+            self._live[reminder_id].sent += 1
+            should_flush = self._touch(reminder_id)
+        if should_flush:
+            self.flush()
+
+    def record_failed(self, reminder_id: int, error: str) -> None:
+        with self._lock:
+            failed_by_error = self._live[reminder_id].failed_by_error
+            failed_by_error[error] = failed_by_error.get(error, 0) + 1
+            should_flush = self._touch(reminder_id)
+        if should_flush:
+            self.flush()
+
+    def finish(self, reminder_id: int) -> None:
+        with self._lock:
+            self._live[reminder_id].finished_at = time.time()
+            self._dirty.add(reminder_id)
+        self.flush()
+
+    def flush(self) -> None:
+        """Write dirty counters to the DB; failures never reach the send loop."""
+        with self._flush_lock:
+            with self._lock:
+                rows = [self._live[reminder_id].to_row() for reminder_id in self._dirty]
+                finished = [
+                    reminder_id
+                    for reminder_id in self._dirty
+                    if self._live[reminder_id].finished_at is not None
+                ]
+                self._dirty.clear()
+                self._pending = 0
+            try:
+                if rows:
+                    self._db.save_reminder_stats(rows)
+            except sqlite3.Error:
+                pass
+            finally:
+                with self._lock:
+                    for reminder_id in finished:
+                        self._live.pop(reminder_id, None)
+
+    def live(self, outage_id: int) -> list[dict]:
+        with self._lock:
+            return [
+                stats.to_row()
+                for stats in self._live.values()
+                if stats.outage_id == outage_id
+            ]
+
+    def outage_stats(self, outage_id: int) -> list[dict]:
+        """Persisted stats for an outage with in-flight counters layered on top."""
+        # Hold the flush lock so a reminder cannot leave ``_live`` between the two reads.
+        with self._flush_lock:
+            rows = {row["reminder_id"]: row for row in self._db.get_reminder_stats(outage_id)}
+            for row in self.live(outage_id):
+                rows[row["reminder_id"]] = row
+        now = time.time()
+        return [describe_stats(rows[reminder_id], now) for reminder_id in sorted(rows)]
+
+    def _touch(self, reminder_id: int) -> bool:
+        self._dirty.add(reminder_id)
+        self._pending += 1
+        return self._pending >= self._flush_every
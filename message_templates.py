@@ -0,0 +1,125 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+DEFAULT_TEMPLATES = {
+    "start": (
+        "💥 СБОЙ НАЧАЛСЯ\n"
+        "📌 {name}\n"
+        "⏱ Время ограничено\n"
+        "🎟 Вход — за Crash\n"
+        "🕒 Время начала: {starts_at}"
+    ),
+    "end": (
+        "✅ СБОЙ ЗАВЕРШЕН\n"
+        "📌 {name}\n"
+        "🕒 Время окончания: {ends_at}"
+    ),
+    "end_5m": (
+        "⏳ СБОЙ СКОРО ЗАКОНЧИТСЯ\n"
+        "📌 {name}\n"
+        "💥 До окончания осталось {remaining}\n"
+        "🕒 Время окончания: {ends_at}"
+    ),
+    "countdown": (
+        "⚠️ Обнаружена аномалия\n"
+        "📌 {name}\n"
+        "💥 Сбой начнется через {remaining}\n"
+        "🕒 Время начала: {starts_at}"
+    ),
+}
+
+END_TEMPLATE_TYPES = {"end", "end_5m"}
+
+# Reminder types from START_REMINDER_SCHEDULE that fall back to "countdown".
+COUNTDOWN_TYPES = {"3d", "1d", "3h", "10m", "5m"}
+
+TEMPLATE_KEYS = set(DEFAULT_TEMPLATES) | COUNTDOWN_TYPES
+
+_REMAINING_MARKER = "\x00remaining\x00"
+
+
+def _format_ts(ts: int) -> str:
+    msk = timezone(timedelta(hours=3))
+    dt = datetime.fromtimestamp(ts, tz=msk)
+    return dt.strftime("%H:%M МСК")
+
+
+def _format_remaining(seconds: int) -> str:
+    if seconds <= 0:
+        return "меньше минуты"
+    minutes = seconds // 60
+    hours = minutes // 60
+    days = hours // 24
+    minutes = minutes % 60
+    hours = hours % 24
+
+    parts: list[str] = []
+    if days:
+        parts.append(f"{days} дн.")
+    if hours:
+        parts.append(f"{hours} ч.")
+    if minutes:
+        parts.append(f"{minutes} мин.")
+    return " ".join(parts) if parts else "меньше минуты"
+
+
+@dataclass(frozen=True)
+class PreparedMessage:
+    """Reminder text with everything except the ``{remaining}`` fragment filled in."""
+
+    parts: tuple[str, ...]
+    target_ts: int
+
+    def render(self, now_ts: int) -> str:
+        if len(self.parts) == 1:
+            return self.parts[0]
+        return _format_remaining(self.target_ts - now_ts).join(self.parts)
+
+
+class MessageTemplates:
+    def __init__(self, templates: dict[str, str] | None = None) -> None:
+        unknown = set(templates or {}) - TEMPLATE_KEYS
+        if unknown:
+            raise ValueError(
+                f"Unknown message template types: {', '.join(sorted(unknown))}. "
+                f"Expected some of: {', '.join(sorted(TEMPLATE_KEYS))}."
+            )
+        merged = dict(DEFAULT_TEMPLATES)
+        merged.update(templates or {})
+        for template_type, template in merged.items():
+            try:
+                template.format(name="", reward="", starts_at="", ends_at="", remaining="")
+            except (KeyError, IndexError, ValueError) as exc:
+                raise ValueError(f"Invalid message template {template_type!r}: {exc!r}") from exc
+        self._templates = merged
+
+    @classmethod
+    def from_file(cls, path: str) -> "MessageTemplates":
+        """Load overrides from a JSON object mapping reminder type to template."""
+        with Path(path).open(encoding="utf-8") as source:
+            templates = json.load(source)
+        if not isinstance(templates, dict) or not all(
+            isinstance(value, str) for value in templates.values()
+        ):
+            raise ValueError(f"{path} must contain a JSON object of string templates.")
+        return cls(templates)
+
+    def prepare(self, reminder) -> PreparedMessage:
+        reminder_type = reminder["type"]
+        template = self._templates.get(reminder_type) or self._templates["countdown"]
+        starts_at = int(reminder["starts_at"])
+        ends_at = int(reminder["ends_at"])
+        text = template.format(
+            name=reminder["name"],
+            reward=reminder["reward"] or "—",
+            starts_at=_format_ts(starts_at),
+            ends_at=_format_ts(ends_at),
+            remaining=_REMAINING_MARKER,
+        )
+        return PreparedMessage(
+            parts=tuple(text.split(_REMAINING_MARKER)),
+            target_ts=ends_at if reminder_type in END_TEMPLATE_TYPES else starts_at,
+        )
@@ -0,0 +1,74 @@
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+
+from storage import Database
+
+
+@dataclass(frozen=True)
+class ScheduleSnapshot:
+    body: bytes
+    etag: str
+    version: int
+    expires_at: int | None
+
+
+class UpcomingOutages:
+    """Serialized list of upcoming and active outages with a strong ETag.
+
+    The snapshot is rebuilt only when ``Database.outages_version`` changes or
+    when an outage in it starts or ends, so polling never touches SQLite.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+        self._lock = threading.Lock()
+        self._snapshot: ScheduleSnapshot | None = None
+
+    def snapshot(self) -> ScheduleSnapshot:
+        now_ts = int(time.time())
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_fresh(snapshot, now_ts):
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or not self._is_fresh(snapshot, now_ts):
+                snapshot = self._build(now_ts)
+                self._snapshot = snapshot
+        return snapshot
+
+    def _is_fresh(self, snapshot: ScheduleSnapshot, now_ts: int) -> bool:
+        if snapshot.version != self._db.outages_version:
+            return False
+        return snapshot.expires_at is None or now_ts < snapshot.expires_at
+
+    def _build(self, now_ts: int) -> ScheduleSnapshot:
+        version = self._db.outages_version
+        rows = self._db.list_upcoming_outages(now_ts)
+        outages: list[dict] = []
+        boundaries: list[int] = []
+        for row in rows:
+            starts_at = int(row["starts_at"])
+            ends_at = int(row["ends_at"])
+            active = starts_at <= now_ts
+            outages.append(
+                {
+                    "id": int(row["id"]),
+                    "name": row["name"],
+                    "reward": row["reward"],
+                    "starts_at": starts_at,
+                    "ends_at": ends_at,
+                    "active": active,
+                }
+            )
+            boundaries.append(ends_at if active else starts_at)
+        body = json.dumps({"outages": outages}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        return ScheduleSnapshot(
+            body=body,
+            etag=etag,
+            version=version,
+            expires_at=min(boundaries) if boundaries else None,
+        )
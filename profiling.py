@@ -0,0 +1,191 @@
+import asyncio
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from telebot import TeleBot
+
+
+# Since Python 3.12 only one cProfile session may be active per process.
+_SESSION_LOCK = threading.Lock()
+
+
+class Profiler:
+    """Opt-in cProfile hooks plus an on-demand sampling capture.
+
+    Hooks are no-ops unless ``enabled`` is set. Only one cProfile session runs
+    per process: short rolling hooks are skipped while another session is
+    active, dumped sessions (broadcasts) wait up to ``dump_wait`` seconds for
+    the lock. Skips are counted per name, and profiler failures never reach
+    the profiled code.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        enabled: bool = False,
+        rolling_flush_interval: int = 60,
+        dump_wait: float = 5.0,
+    ) -> None:
+        self._directory = Path(directory)
+        self.enabled = enabled
+        self._rolling_flush_interval = rolling_flush_interval
+        self._dump_wait = dump_wait
+        self._skipped: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._rolling: dict[str, pstats.Stats] = {}
+        self._rolling_flushed_at: dict[str, float] = {}
+        self._capture_thread: threading.Thread | None = None
+
+    @contextmanager
+    def profile(self, name: str, dump: bool = False):
+        """Profile the block and merge it into the rolling profile for ``name``.
+
+        With ``dump`` the block is additionally written to its own ``.prof`` file.
+        """
+        if not self.enabled:
+            yield
+            return
+        if dump:
+            acquired = _SESSION_LOCK.acquire(timeout=self._dump_wait)
+        else:
+            acquired = _SESSION_LOCK.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                self._skipped[name] += 1
+            yield
+            return
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except Exception:
+            # Another profiling tool (e.g. an external debugger) owns the hook.
+            _SESSION_LOCK.release()
+            profile = None
+            with self._lock:
+                self._skipped[name] += 1
+        try:
+            yield
+        finally:
+            if profile is not None:
+                try:
+                    profile.disable()
+                finally:
+                    _SESSION_LOCK.release()
+                try:
+                    self._record(name, profile, dump)
+                except Exception:
+                    pass
+
+    def wrap(self, name: str, func):
+        if asyncio.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with self.profile(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.profile(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def status(self) -> dict:
+        with self._lock:
+            skipped = dict(self._skipped)
+        capturing = self._capture_thread is not None and self._capture_thread.is_alive()
+        return {"enabled": self.enabled, "capturing": capturing, "skipped_sessions": skipped}
+
+    def start_capture(self, seconds: float, interval: float = 0.01) -> str | None:
+        """Sample stacks of all threads for ``seconds`` in the background.
+
+        Returns the path of the collapsed-stack output file, or ``None`` if a
+        capture is already running.
+        """
+        with self._lock:
+            if self._capture_thread and self._capture_thread.is_alive():
+                return None
+            path = self._directory / f"capture-{time.strftime('%Y%m%d-%H%M%S')}.folded"
+            self._capture_thread = threading.Thread(
+                target=self._sample,
+                args=(path, seconds, interval),
+                daemon=True,
+            )
+            self._capture_thread.start()
+        return str(path)
+
+    def _record(self, name: str, profile: cProfile.Profile, dump: bool) -> None:
+        os.makedirs(self._directory, exist_ok=True)
+        if dump:
+            profile.dump_stats(self._directory / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+
+        now = time.monotonic()
+        with self._lock:
+            rolling = self._rolling.get(name)
+            if rolling is None:
+                self._rolling[name] = pstats.Stats(profile)
+                self._rolling_flushed_at[name] = 0.0
+            else:
+                rolling.add(profile)
+            if now - self._rolling_flushed_at[name] < self._rolling_flush_interval:
+                return
+            self._rolling_flushed_at[name] = now
+            self._rolling[name].dump_stats(self._directory / f"rolling-{name}.prof")
+
+    def _sample(self, path: Path, seconds: float, interval: float) -> None:
+        own_id = threading.get_ident()
+        stacks: Counter[str] = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                parts: list[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stacks[";".join(reversed(parts))] += 1
+            time.sleep(interval)
+
+        os.makedirs(self._directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as output:
+            for stack, count in stacks.most_common():
+                output.write(f"{stack} {count}\n")
+
+
+def instrument_bot_handlers(bot: TeleBot, profiler: Profiler) -> None:
+    """Wrap every registered message and callback handler with a profiling hook."""
+    if not profiler.enabled:
+        return
+    for handlers in (bot.message_handlers, bot.callback_query_handlers):
+        for handler in handlers:
+            func = handler["function"]
+            handler["function"] = profiler.wrap(f"handler.{func.__name__}", func)
+
+
+def instrument_api_routes(app: FastAPI, profiler: Profiler) -> None:
+    """Wrap every route endpoint so it is profiled in the thread that runs it.
+
+    Sync endpoints run in the threadpool, so a middleware on the event loop
+    would miss their work; wrapping ``dependant.call`` profiles it in place.
+    """
+    if not profiler.enabled:
+        return
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.dependant.call = profiler.wrap(f"api.{route.name}", route.dependant.call)
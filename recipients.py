@@ -0,0 +1,56 @@
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+
+
+class RecipientSet:
+    """Sorted ``array('q')`` of user ids, 8 bytes per recipient."""
+
+    def __init__(self, user_ids: Iterable[int] = ()) -> None:
+        self._lock = threading.Lock()
+        self._ids = array("q", sorted(set(user_ids)))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, user_id: int) -> bool:
+        with self._lock:
+            index = bisect_left(self._ids, user_id)
+            return index < len(self._ids) and self._ids[index] == user_id
+
+    def add(self, user_id: int) -> None:
+        with self._lock:
+            index = bisect_left(self._ids, user_id)
+            if index < len(self._ids) and self._ids[index] == user_id:
+                return
+            self._ids.insert(index, user_id)
+
+    def discard(self, user_id: int) -> None:
+        with self._lock:
+            index = bisect_left(self._ids, user_id)
+            if index < len(self._ids) and self._ids[index] == user_id:
+                del self._ids[index]
+
+    def snapshot(self) -> array:
+        """Copy of the current ids, safe to iterate while the set keeps changing."""
+        with self._lock:
+            return array("q", self._ids)
+
+    def chunks(self, size: int) -> Iterator[array]:
+        ids = self.snapshot()
+        for start in range(0, len(ids), size):
+            yield ids[start:start + size]
+
+    def partition(self, parts: int) -> list[array]:
+        """Split the ids into ``parts`` contiguous ranges of near-equal size."""
+        ids = self.snapshot()
+        parts = max(1, min(parts, len(ids)))
+        step, extra = divmod(len(ids), parts)
+        ranges: list[array] = []
+        start = 0
+        for index in range(parts):
+            end = start + step + (1 if index < extra else 0)
+            ranges.append(ids[start:end])
+            start = end
+        return ranges
@@ -1,11 +1,14 @@
 import threading
 import time
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 
 from telebot import TeleBot
 from telebot.apihelper import ApiTelegramException
 
+from delivery_stats import DeliveryStats
 from keyboards.game_kb import notification_keyboard
+from message_templates import MessageTemplates
+from profiling import Profiler
 from storage import Database
 
 
@@ -23,30 +26,6 @@ END_REMINDER_SCHEDULE = [
     ("end", timedelta(seconds=0)),
 ]
 
-def _format_ts(ts: int) -> str:
-    msk = timezone(timedelta(hours=3))
-    dt = datetime.fromtimestamp(ts, tz=msk)
-    return dt.strftime("%H:%M МСК")
-
-
-def _format_remaining(seconds: int) -> str:
-    if seconds <= 0:
-        return "меньше минуты"
-    minutes = seconds // 60
-    hours = minutes // 60
-    days = hours // 24
-    minutes = minutes % 60
-    hours = hours % 24
-
-    parts: list[str] = []
-    if days:
-        parts.append(f"{days} дн.")
-    if hours:
-        parts.append(f"{hours} ч.")
-    if minutes:
-        parts.append(f"{minutes} мин.")
-    return " ".join(parts) if parts else "меньше минуты"
-
 
 class ReminderService:
     def __init__(
@@ -55,11 +34,18 @@ class ReminderService:
         db: Database,
         poll_interval: int = 30,
         game_url: str | None = None,
+        profiler: Profiler | None = None,
+        templates: MessageTemplates | None = None,
+        chunk_size: int = 200,
     ) -> None:
         self._bot = bot
         self._db = db
         self._poll_interval = poll_interval
         self._game_url = game_url
+        self.stats = DeliveryStats(db)
+        self._profiler = profiler or Profiler("profiles")
+        self._templates = templates or MessageTemplates()
+        self._chunk_size = chunk_size
         self._stop_event = threading.Event()
         self._thread: threading.Thread | None = None
 
@@ -94,66 +80,41 @@ class ReminderService:
             now_ts = int(time.time())
             due_reminders = self._db.get_due_reminders(now_ts)
             if due_reminders:
-                self._dispatch_reminders(due_reminders, now_ts)
+                self._dispatch_reminders(due_reminders)
             self._stop_event.wait(self._poll_interval)
 
-    def _dispatch_reminders(self, reminders, now_ts: int) -> None:
-        user_ids = self._db.list_user_ids(only_accepted=True, only_notify=True)
-        if not user_ids:
+    def _dispatch_reminders(self, reminders) -> None:
+        with self._profiler.profile("broadcast", dump=True):
+            self._send_reminders(reminders)
+
+    def _send_reminders(self, reminders) -> None:
+        recipients = self._db.recipients()
+        if not len(recipients):
             for reminder in reminders:
+                self.stats.begin(reminder, targeted=0)
+                self.stats.finish(reminder["id"])
                 self._db.mark_reminder_sent(reminder["id"])
             return
 
         for reminder in reminders:
-            message = self._build_message(reminder, now_ts)
+            reminder_id = reminder["id"]
+            prepared = self._templates.prepare(reminder)
             markup = self._build_markup(reminder)
-            for user_id in user_ids:
-                try:
-                    self._bot.send_message(chat_id=user_id, text=message, reply_markup=markup)
-                except ApiTelegramException:
-                    continue
-                except Exception:
-                    continue
-            self._db.mark_reminder_sent(reminder["id"])
-
-    def _build_message(self, reminder, now_ts: int) -> str:
-        name = reminder["name"]
-        reward = reminder["reward"] or "—"
-        starts_at = _format_ts(int(reminder["starts_at"]))
-        ends_at = _format_ts(int(reminder["ends_at"]))
-        if reminder["type"] == "start":
-            return (
-                "💥 СБОЙ НАЧАЛСЯ\n"
-                f"📌 {name}\n"
-                "⏱ Время ограничено\n"
-                "🎟 Вход — за Crash\n"
-                # f"🏆 Награда: {reward}\n"
-                f"🕒 Время начала: {starts_at}"
-            )
-        if reminder["type"] == "end":
-            return (
-                "✅ СБОЙ ЗАВЕРШЕН\n"
-                f"📌 {name}\n"
-                # f"🏆 Награда: {reward}\n"
-                f"🕒 Время окончания: {ends_at}"
-            )
-        if reminder["type"] == "end_5m":
-            remaining = _format_remaining(int(reminder["ends_at"]) - now_ts)
-            return (
-                "⏳ СБОЙ СКОРО ЗАКОНЧИТСЯ\n"
-                f"📌 {name}\n"
-                f"💥 До окончания осталось {remaining}\n"
-                # f"🏆 Награда: {reward}\n"
-                f"🕒 Время окончания: {ends_at}"
-            )
-        remaining = _format_remaining(int(reminder["starts_at"]) - now_ts)
-        return (
-            "⚠️ Обнаружена аномалия\n"
-            f"📌 {name}\n"
-            f"💥 Сбой начнется через {remaining}\n"
-            # f"🏆 Награда: {reward}\n"
-            f"🕒 Время начала: {starts_at}"
-        )
+            self.stats.begin(reminder, targeted=len(recipients))
+            for chunk in recipients.chunks(self._chunk_size):
+                message = prepared.render(int(time.time()))
+                for user_id in chunk:
+                    try:
+                        self._bot.send_message(chat_id=user_id, text=message, reply_markup=markup)
+                    except ApiTelegramException as exc:
+                        self.stats.record_failed(reminder_id, f"telegram_{exc.error_code}")
+                        continue
+                    except Exception as exc:
+                        self.stats.record_failed(reminder_id, type(exc).__name__)
+                        continue
+                    self.stats.record_sent(reminder_id)
+            self.stats.finish(reminder_id)
+            self._db.mark_reminder_sent(reminder_id)
 
     def _build_markup(self, reminder):
         return notification_keyboard(
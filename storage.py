@@ -1,16 +1,47 @@
+import json
+import os
 import sqlite3
 import threading
 import time
+from dataclasses import dataclass
+
+from recipients import RecipientSet
+
+
+SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+TEMP_STORE_MODES = {"DEFAULT", "FILE", "MEMORY"}
+CHECKPOINT_MODES = {"PASSIVE", "FULL", "RESTART", "TRUNCATE"}
+
+
+@dataclass
+class SqliteTuning:
+    synchronous: str = "NORMAL"
+    cache_size: int = -20000
+    mmap_size: int = 268435456
+    busy_timeout: int = 5000
+    temp_store: str = "MEMORY"
 
 
 class Database:
-    def __init__(self, path: str) -> None:
+    def __init__(self, path: str, tuning: SqliteTuning | None = None) -> None:
+        tuning = tuning or SqliteTuning()
+        if tuning.synchronous.upper() not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Unsupported synchronous level: {tuning.synchronous}")
+        if tuning.temp_store.upper() not in TEMP_STORE_MODES:
+            raise ValueError(f"Unsupported temp_store mode: {tuning.temp_store}")
         self._path = path
         self._lock = threading.Lock()
         self._conn = sqlite3.connect(self._path, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        self._conn.execute(f"PRAGMA busy_timeout={int(tuning.busy_timeout)}")
         self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={tuning.synchronous.upper()}")
+        self._conn.execute(f"PRAGMA cache_size={int(tuning.cache_size)}")
+        self._conn.execute(f"PRAGMA mmap_size={int(tuning.mmap_size)}")
+        self._conn.execute(f"PRAGMA temp_store={tuning.temp_store.upper()}")
         self._conn.execute("PRAGMA foreign_keys=ON")
+        self._recipients: RecipientSet | None = None
+        self.outages_version = 0
 
     def init(self) -> None:
         with self._lock:
@@ -46,6 +77,23 @@ class Database:
 
                 CREATE INDEX IF NOT EXISTS idx_reminders_send_at
                 ON reminders (send_at);
+
+                CREATE TABLE IF NOT EXISTS reminder_stats (
+                    reminder_id INTEGER PRIMARY KEY,
+                    outage_id INTEGER NOT NULL,
+                    type TEXT NOT NULL,
+                    targeted INTEGER NOT NULL DEFAULT 0,
+                    sent INTEGER NOT NULL DEFAULT 0,
+                    failed INTEGER NOT NULL DEFAULT 0,
+                    failed_by_error TEXT NOT NULL DEFAULT '{}',
+                    started_at REAL,
+                    finished_at REAL,
+                    FOREIGN KEY (reminder_id) REFERENCES reminders (id) ON DELETE CASCADE,
+                    FOREIGN KEY (outage_id) REFERENCES outages (id) ON DELETE CASCADE
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_reminder_stats_outage_id
+                ON reminder_stats (outage_id);
                 """
             )
             try:
@@ -60,6 +108,25 @@ class Database:
                 pass
             self._conn.commit()
 
+    def wal_size(self) -> int:
+        try:
+            return os.path.getsize(f"{self._path}-wal")
+        except OSError:
+            return 0
+
+    def checkpoint(self, mode: str = "PASSIVE") -> tuple[int, int, int]:
+        """Run ``wal_checkpoint`` and return ``(busy, wal_frames, checkpointed_frames)``."""
+        mode = mode.upper()
+        if mode not in CHECKPOINT_MODES:
+            raise ValueError(f"Unsupported checkpoint mode: {mode}")
+        with self._lock:
+            row = self._conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        return int(row[0]), int(row[1]), int(row[2])
+
+    def optimize(self) -> None:
+        with self._lock:
+            self._conn.execute("PRAGMA optimize")
+
     def ensure_user(self, user_id: int) -> None:
         now_ts = int(time.time())
         with self._lock:
@@ -82,6 +149,7 @@ class Database:
                 (accepted_at, user_id),
             )
             self._conn.commit()
+            self._sync_recipient(user_id)
 
     def is_legal_accepted(self, user_id: int) -> bool:
         with self._lock:
@@ -103,6 +171,7 @@ class Database:
                 (1 if enabled else 0, user_id),
             )
             self._conn.commit()
+            self._sync_recipient(user_id)
 
     def is_notify_enabled(self, user_id: int) -> bool:
         with self._lock:
@@ -126,6 +195,29 @@ class Database:
             rows = self._conn.execute(query, params).fetchall()
         return [int(row["user_id"]) for row in rows]
 
+    def recipients(self) -> RecipientSet:
+        """Users with accepted rules and notifications on, loaded once and kept in sync."""
+        with self._lock:
+            if self._recipients is None:
+                rows = self._conn.execute(
+                    "SELECT user_id FROM users "
+                    "WHERE legal_accepted = 1 AND COALESCE(notify_on, 0) = 1"
+                ).fetchall()
+                self._recipients = RecipientSet(int(row["user_id"]) for row in rows)
+            return self._recipients
+
+    def _sync_recipient(self, user_id: int) -> None:
+        if self._recipients is None:
+            return
+        row = self._conn.execute(
+            "SELECT legal_accepted, COALESCE(notify_on, 0) AS notify_on FROM users WHERE user_id = ?",
+            (user_id,),
+        ).fetchone()
+        if row and row["legal_accepted"] and row["notify_on"]:
+            self._recipients.add(user_id)
+        else:
+            self._recipients.discard(user_id)
+
     def create_outage(self, name: str, reward: str | None, starts_at: int, ends_at: int) -> int:
         now_ts = int(time.time())
         with self._lock:
@@ -137,8 +229,30 @@ class Database:
                 (name, reward, starts_at, ends_at, now_ts),
             )
             self._conn.commit()
+            self.outages_version += 1
             return int(cursor.lastrowid)
 
+    def get_outage(self, outage_id: int) -> sqlite3.Row | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, name, reward, starts_at, ends_at FROM outages WHERE id = ?",
+                (outage_id,),
+            ).fetchone()
+        return row
+
+    def list_upcoming_outages(self, now_ts: int) -> list[sqlite3.Row]:
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT id, name, reward, starts_at, ends_at
+                FROM outages
+                WHERE ends_at > ?
+                ORDER BY starts_at ASC, id ASC
+                """,
+                (now_ts,),
+            ).fetchall()
+        return rows
+
     def delete_outage_by_name(self, name: str) -> int:
         with self._lock:
             cursor = self._conn.execute(
@@ -146,6 +260,8 @@ class Database:
                 (name,),
             )
             self._conn.commit()
+            if cursor.rowcount:
+                self.outages_version += 1
         return int(cursor.rowcount)
 
     def create_reminders(self, outage_id: int, reminders: list[tuple[str, int]]) -> int:
@@ -166,7 +282,7 @@ class Database:
         with self._lock:
             rows = self._conn.execute(
                 """
-                SELECT r.id, r.type, r.send_at, o.name, o.reward, o.starts_at, o.ends_at
+                SELECT r.id, r.outage_id, r.type, r.send_at, o.name, o.reward, o.starts_at, o.ends_at
                 FROM reminders r
                 JOIN outages o ON o.id = r.outage_id
                 WHERE r.sent_at IS NULL AND r.send_at <= ?
@@ -185,3 +301,51 @@ class Database:
                 (sent_at, reminder_id),
             )
             self._conn.commit()
+
+    def save_reminder_stats(self, stats: list[dict]) -> None:
+        """Upsert stats rows, skipping reminders deleted while they were being sent."""
+        rows = [{**item, "failed_by_error": json.dumps(item["failed_by_error"])} for item in stats]
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT INTO reminder_stats (
+                        reminder_id, outage_id, type, targeted, sent, failed,
+                        failed_by_error, started_at, finished_at
+                    )
+                    SELECT :reminder_id, :outage_id, :type, :targeted, :sent, :failed,
+                           :failed_by_error, :started_at, :finished_at
+                    WHERE EXISTS (SELECT 1 FROM reminders WHERE id = :reminder_id)
+                    ON CONFLICT (reminder_id) DO UPDATE SET
+                        targeted = excluded.targeted,
+                        sent = excluded.sent,
+                        failed = excluded.failed,
+                        failed_by_error = excluded.failed_by_error,
+                        started_at = excluded.started_at,
+                        finished_at = excluded.finished_at
+                    """,
+                    rows,
+                )
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+
+    def get_reminder_stats(self, outage_id: int) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT reminder_id, outage_id, type, targeted, sent, failed,
+                       failed_by_error, started_at, finished_at
+                FROM reminder_stats
+                WHERE outage_id = ?
+                ORDER BY reminder_id ASC
+                """,
+                (outage_id,),
+            ).fetchall()
+        result: list[dict] = []
+        for row in rows:
+            item = dict(row)
+            item["failed_by_error"] = json.loads(item["failed_by_error"] or "{}")
+            result.append(item)
+        return result
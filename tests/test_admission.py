@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from admission import RouteGate, RouteLimit
+
+
+async def _handle(gate: RouteGate, hold: asyncio.Event) -> bool:
+    if not await gate.acquire():
+        return False
+    try:
+        await hold.wait()
+    finally:
+        gate.release()
+    return True
+
+
+def test_burst_is_capped_at_concurrency_plus_queue():
+    async def scenario():
+        gate = RouteGate(RouteLimit(concurrency=2, queue=3, queue_timeout=0.2))
+        hold = asyncio.Event()
+        tasks = [asyncio.create_task(_handle(gate, hold)) for _ in range(10)]
+        await asyncio.sleep(0)
+        status = gate.status()
+        hold.set()
+        results = await asyncio.gather(*tasks)
+        return gate, status, results
+
+    gate, status, results = asyncio.run(scenario())
+
+    assert status["in_flight"] == 2
+    assert status["queued"] == 3
+    assert gate.rejected == 5
+    assert gate.max_queued == 3
+    assert gate.timed_out == 0
+    assert results.count(True) == 5
+    assert gate.in_flight == 0
+    assert gate.queued == 0
+
+
+def test_queued_request_times_out():
+    async def scenario():
+        gate = RouteGate(RouteLimit(concurrency=1, queue=1, queue_timeout=0.01))
+        hold = asyncio.Event()
+        holder = asyncio.create_task(_handle(gate, hold))
+        await asyncio.sleep(0)
+        admitted = await gate.acquire()
+        hold.set()
+        await holder
+        return gate, admitted
+
+    gate, admitted = asyncio.run(scenario())
+
+    assert admitted is False
+    assert gate.timed_out == 1
+    assert gate.in_flight == 0
+    assert gate.queued == 0
+
+
+def test_slot_is_handed_to_waiter_on_release():
+    async def scenario():
+        gate = RouteGate(RouteLimit(concurrency=1, queue=1, queue_timeout=1))
+        assert await gate.acquire()
+        waiter = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        gate.release()
+        admitted = await waiter
+        in_flight = gate.in_flight
+        gate.release()
+        return gate, admitted, in_flight
+
+    gate, admitted, in_flight = asyncio.run(scenario())
+
+    assert admitted is True
+    assert in_flight == 1
+    assert gate.in_flight == 0
+    assert gate.admitted == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"concurrency": 0, "queue": 1, "queue_timeout": 1},
+        {"concurrency": 1, "queue": -1, "queue_timeout": 1},
+        {"concurrency": 1, "queue": 1, "queue_timeout": -0.5},
+    ],
+)
+def test_invalid_limits_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        RouteLimit(**kwargs)
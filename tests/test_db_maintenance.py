@@ -0,0 +1,19 @@
+import pytest
+
+from db_maintenance import DatabaseMaintenance
+from storage import Database
+
+
+def test_poll_interval_follows_shortest_interval(tmp_path):
+    db = Database(str(tmp_path / "data.sqlite3"))
+
+    assert DatabaseMaintenance(db, checkpoint_interval=5, optimize_interval=3600)._poll_interval == 5
+    assert DatabaseMaintenance(db, checkpoint_interval=300, optimize_interval=10)._poll_interval == 10
+    assert DatabaseMaintenance(db, checkpoint_interval=300, optimize_interval=3600)._poll_interval == 30
+
+
+def test_non_positive_interval_is_rejected(tmp_path):
+    db = Database(str(tmp_path / "data.sqlite3"))
+
+    with pytest.raises(ValueError):
+        DatabaseMaintenance(db, checkpoint_interval=0)
@@ -0,0 +1,48 @@
+import time
+
+from delivery_stats import DeliveryStats
+from storage import Database
+
+
+def _due_reminder(db: Database, name: str = "Сбой"):
+    now_ts = int(time.time())
+    outage_id = db.create_outage(name=name, reward=None, starts_at=now_ts + 60, ends_at=now_ts + 120)
+    db.create_reminders(outage_id, [("start", now_ts)])
+    (reminder,) = db.get_due_reminders(now_ts)
+    return outage_id, reminder
+
+
+def test_counters_are_flushed_and_dropped_from_live(tmp_path):
+    db = Database(str(tmp_path / "data.sqlite3"))
+    db.init()
+    outage_id, reminder = _due_reminder(db)
+    stats = DeliveryStats(db, flush_every=2)
+
+    stats.begin(reminder, targeted=3)
+    stats.record_sent(reminder["id"])
+    stats.record_failed(reminder["id"], "telegram_403")
+    stats.record_sent(reminder["id"])
+    stats.finish(reminder["id"])
+
+    assert stats.live(outage_id) == []
+    (row,) = stats.outage_stats(outage_id)
+    assert row["sent"] == 2
+    assert row["failed"] == 1
+    assert row["failed_by_error"] == {"telegram_403": 1}
+    assert row["in_flight"] is False
+
+
+def test_outage_deleted_mid_broadcast(tmp_path):
+    db = Database(str(tmp_path / "data.sqlite3"))
+    db.init()
+    outage_id, reminder = _due_reminder(db)
+    stats = DeliveryStats(db, flush_every=1)
+
+    stats.begin(reminder, targeted=2)
+    stats.record_sent(reminder["id"])
+    db.delete_outage_by_name("Сбой")
+    stats.record_sent(reminder["id"])
+    stats.finish(reminder["id"])
+
+    assert stats.live(outage_id) == []
+    assert stats.outage_stats(outage_id) == []
@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+from message_templates import MessageTemplates
+
+
+REMINDER = {"type": "3d", "name": "Сбой", "reward": None, "starts_at": 1_000_000, "ends_at": 1_003_600}
+
+
+def test_type_specific_override_wins_over_countdown():
+    templates = MessageTemplates({"3d": "{name} через {remaining}"})
+
+    assert templates.prepare(REMINDER).render(1_000_000 - 3 * 86400) == "Сбой через 3 дн."
+    assert "аномалия" in templates.prepare({**REMINDER, "type": "1d"}).render(1_000_000)
+
+
+@pytest.mark.parametrize("key", ["strat", "countdwon", "end_10m"])
+def test_unknown_template_type_is_rejected(key):
+    with pytest.raises(ValueError, match=key):
+        MessageTemplates({key: "{name}"})
+
+
+def test_from_file_rejects_unknown_keys(tmp_path):
+    path = tmp_path / "templates.json"
+    path.write_text(json.dumps({"strat": "{name}"}), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="strat"):
+        MessageTemplates.from_file(str(path))